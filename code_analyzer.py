@@ -7,18 +7,39 @@ Usage examples (from the project root):
 
     # Scan another directory and output JSON
     python code_analyzer.py /path/to/other/project --format json
+
+    # Spread the scan of a large project over 4 worker processes
+    python code_analyzer.py /path/to/large/project --jobs 4
+
+    # Reuse results for unchanged files across runs
+    python code_analyzer.py . --cache-dir ~/.cache/code-analyzer
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List
 
 from detectors.vulnerability_scanner import Vulnerability, scan_project
 
 
+def _job_count(value: str) -> int:
+    """argparse type for --jobs: a non-negative integer (0 = all cores)."""
+
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or a positive number, got {jobs}")
+    return jobs
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Simple multi-language static vulnerability scanner.",
@@ -35,6 +56,19 @@ def parse_args() -> argparse.Namespace:
         default="text",
         help="Output format for results (default: text)",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_job_count,
+        default=1,
+        help="Number of worker processes to scan files with; 0 uses all CPU cores (default: 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory to keep per-file results in, reused by later runs for unchanged files; never pruned (default: no cache)",
+    )
     return parser.parse_args()
 
 
@@ -43,30 +77,53 @@ def print_text(findings: List[Vulnerability]) -> None:
         print("No potential vulnerabilities found.")
         return
 
-    print(f"Found {len(findings)} potential issue(s):")
-    print("-" * 80)
+    separator = "-" * 80 + "\n"
+    write = sys.stdout.write
+
+    write(f"Found {len(findings)} potential issue(s):\n")
+    write(separator)
 
+    # One write per finding instead of a print() (and its separate newline
+    # write) per output line.
     for vuln in findings:
-        print(
+        code = f"    > {vuln.code}\n" if vuln.code else ""
+        write(
             f"[{vuln.severity.upper()}] {vuln.language} {vuln.rule_id} "
-            f"{vuln.file_path}:{vuln.line}"
+            f"{vuln.file_path}:{vuln.line}\n"
+            f"    {vuln.description}\n"
+            f"{code}{separator}"
         )
-        print(f"    {vuln.description}")
-        if vuln.code:
-            print(f"    > {vuln.code}")
-        print("-" * 80)
 
 
 def print_json(findings: List[Vulnerability]) -> None:
-    data = [v.to_dict() for v in findings]
-    print(json.dumps(data, indent=2))
+    # Stream the array one finding at a time rather than building every dict
+    # and the full document in memory first. The output is byte-for-byte the
+    # same as json.dumps(list_of_dicts, indent=2).
+    if not findings:
+        print("[]")
+        return
+
+    write = sys.stdout.write
+    last = len(findings) - 1
+
+    write("[\n")
+    for index, vuln in enumerate(findings):
+        item = json.dumps(vuln.to_dict(), indent=2).replace("\n", "\n  ")
+        write("  " + item + (",\n" if index < last else "\n"))
+    write("]\n")
 
 
 def main() -> None:
     args = parse_args()
     root = Path(args.path).expanduser().resolve()
+    cache_dir = args.cache_dir.expanduser() if args.cache_dir else None
 
-    findings = scan_project(root)
+    jobs = args.jobs or (os.cpu_count() or 1)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            findings = scan_project(root, executor=executor, cache_dir=cache_dir)
+    else:
+        findings = scan_project(root, cache_dir=cache_dir)
 
     if args.format == "json":
         print_json(findings)
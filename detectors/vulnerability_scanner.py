@@ -13,16 +13,25 @@ Supported languages (by file extension):
 
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
+import multiprocessing
 import os
 import re
-from dataclasses import asdict, dataclass
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 # Directories that will be skipped during traversal
 # These include VCS metadata, virtualenvs, caches, and common build / output
 # folders used by tools like Angular, React, and TypeScript.
-EXCLUDED_DIRS = {
+EXCLUDED_DIRS = frozenset({
     ".git",
     ".hg",
     ".svn",
@@ -40,7 +49,10 @@ EXCLUDED_DIRS = {
     ".angular",
     "coverage",
     ".cache",
-}
+})
+
+# Sort order for severities (most severe first); unknown severities sort last.
+SEVERITY_RANK: Dict[str, int] = {"high": 0, "medium": 1, "low": 2}
 
 # Very small language detector based on file extension
 EXTENSION_LANGUAGE: Dict[str, str] = {
@@ -68,6 +80,20 @@ class Rule:
 class Vulnerability:
     """Represents a single potential vulnerability finding."""
 
+    # Scans can produce many findings and the web UI / GUI read every field
+    # of each one while rendering; slots keep instances small and attribute
+    # access cheap. (Declared by hand as dataclass(slots=True) needs 3.10.)
+    __slots__ = (
+        "rule_id",
+        "description",
+        "severity",
+        "language",
+        "file_path",
+        "line",
+        "code",
+        "severity_rank",
+    )
+
     rule_id: str
     description: str
     severity: str
@@ -76,8 +102,26 @@ class Vulnerability:
     line: int
     code: str
 
+    def __post_init__(self) -> None:
+        # Not a dataclass field (so it stays out of repr/eq/to_dict): an int
+        # precomputed from severity so sorting compares ints instead of calling
+        # severity.lower() and a dict lookup on every comparison.
+        self.severity_rank: int = SEVERITY_RANK.get(
+            self.severity.lower(), len(SEVERITY_RANK)
+        )
+
     def to_dict(self) -> Dict[str, object]:
-        return asdict(self)
+        # Built field by field: dataclasses.asdict() recurses and deep-copies
+        # every value, which dominates JSON export time for large scans.
+        return {
+            "rule_id": self.rule_id,
+            "description": self.description,
+            "severity": self.severity,
+            "language": self.language,
+            "file_path": self.file_path,
+            "line": self.line,
+            "code": self.code,
+        }
 
 
 def _compile(pattern: str, ignore_case: bool = False) -> re.Pattern:
@@ -242,6 +286,35 @@ LANGUAGE_RULES: Dict[str, Sequence[Rule]] = {
     "java": JAVA_RULES,
 }
 
+# Per-file findings from earlier scans in this process, keyed by file path and
+# validated against the file's (mtime_ns, size). Re-scanning a project (e.g.
+# repeated scans from the web UI or GUI) only re-reads files that changed.
+# Least recently used entries are evicted beyond _FILE_CACHE_MAX_ENTRIES so a
+# long-running server that scans many trees does not grow without bound. The
+# lock makes it safe to share between the web server's handler threads.
+_FILE_CACHE: OrderedDict[str, Tuple[Tuple[int, int], List[Vulnerability]]] = OrderedDict()
+_FILE_CACHE_MAX_ENTRIES = 20_000
+_FILE_CACHE_LOCK = threading.Lock()
+# Like git's "racily clean" index entries: a file modified this close to when
+# it was scanned could be edited again without its (mtime, size) changing on
+# filesystems with coarse timestamps (FAT, HFS+, some NFS), so its findings
+# are not cached.
+_RACY_MTIME_WINDOW_NS = 3_000_000_000
+
+# Optional on-disk cache shared between runs (see scan_project's cache_dir).
+# Entries are keyed by a hash of the file's bytes, its language and every rule
+# definition, so they stay valid across checkouts and renames and are never
+# reused once a rule changes. Bump the version when the entry format or the
+# matching logic changes. Entries are plain JSON (never pickle), so a cache
+# directory shared with others cannot be used to run code in the scanner.
+# Nothing prunes the directory: every edited file adds a new entry, so delete
+# it now and then to reclaim space.
+_DISK_CACHE_VERSION = 2
+_rules_digest: Optional[bytes] = None
+# Compact UTF-8 JSON: entries are smaller and load faster than the default
+# ASCII-escaped, space-separated form, and loads happen on every warm run.
+_ENTRY_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
 
 def detect_language(path: Path) -> Optional[str]:
     """Return a language name for the given file path, or None if unknown."""
@@ -258,50 +331,303 @@ def scan_text(
     if not rules:
         return []
 
+    return _build_findings(language, file_path, _match_lines(rules, text))
+
+
+def _match_lines(rules: Sequence[Rule], text: str) -> List[Tuple[int, int, str]]:
+    """Return ``(line, rule index, code)`` for each rule hit, in report order."""
+
+    if "\r" in text:
+        # Treat \r\n and lone \r as line breaks too (universal newlines), so
+        # text passed to scan_text directly gets the same line numbers as a
+        # file read from disk.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    # Each rule is searched over the whole buffer, jumping from one match to
+    # the next, instead of being tried against every line. A match that ends
+    # within its line is a per-line match; one that runs past the newline
+    # only nominates its line, which is then re-checked with a search bounded
+    # to that line so multi-line matches are not reported. Line numbers are
+    # derived from newline counts only for matched lines.
+    find = text.find
+    rfind = text.rfind
+    count = text.count
+    length = len(text)
+    hits: List[Tuple[int, int, int, int]] = []
+
+    for index, rule in enumerate(rules):
+        search = rule.pattern.search
+        match = search(text)
+        line_no = 1
+        counted = 0
+
+        while match is not None:
+            start = rfind("\n", 0, match.start()) + 1
+            if start >= length:
+                break
+            end = find("\n", start)
+            if end < 0:
+                end = length
+
+            line_no += count("\n", counted, start)
+            counted = start
+
+            if match.end() <= end or search(text, start, end):
+                hits.append((line_no, index, start, end))
+
+            if end >= length:
+                break
+            match = search(text, end + 1)
+
+    # Report findings line by line, in rule order within a line.
+    hits.sort()
+
+    return [
+        (line_no, index, text[start:end].strip())
+        for line_no, index, start, end in hits
+    ]
+
+
+def _build_findings(
+    language: str, file_path: Path, hits: List[Tuple[int, int, str]]
+) -> List[Vulnerability]:
+    rules = LANGUAGE_RULES[language]
+    file_path_str = str(file_path)
     findings: List[Vulnerability] = []
-    lines = text.splitlines()
-
-    for line_no, line in enumerate(lines, start=1):
-        for rule in rules:
-            if rule.pattern.search(line):
-                findings.append(
-                    Vulnerability(
-                        rule_id=rule.id,
-                        description=rule.description,
-                        severity=rule.severity,
-                        language=language,
-                        file_path=str(file_path),
-                        line=line_no,
-                        code=line.strip(),
-                    )
-                )
+
+    for line_no, index, code in hits:
+        rule = rules[index]
+        findings.append(
+            Vulnerability(
+                rule_id=rule.id,
+                description=rule.description,
+                severity=rule.severity,
+                language=language,
+                file_path=file_path_str,
+                line=line_no,
+                code=code,
+            )
+        )
 
     return findings
 
 
 def scan_file(path: Path) -> List[Vulnerability]:
-    """Scan a single file for potential vulnerabilities."""
+    """Scan a single file for potential vulnerabilities.
+
+    Findings may come from the in-process cache shared with
+    :func:`scan_project` when the file's modification time and size are
+    unchanged since it was last scanned; see :func:`clear_cache`. Files
+    modified within a few seconds of being scanned are never cached, so a
+    quick same-size edit is not missed on filesystems with coarse mtimes.
+    """
 
     language = detect_language(path)
     if language is None:
         return []
 
+    return _scan_source(path, language)
+
+
+def _scan_source(
+    path: Path, language: str, cache_dir: Optional[str] = None
+) -> List[Vulnerability]:
+    """Scan *path* as *language*, reusing cached findings when unchanged."""
+
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return []
+
+    cache_key = str(path)
+    cached = _cache_get(cache_key, stamp)
+    if cached is not None:
+        return list(cached)
+
+    findings = _read_and_scan(path, language, cache_dir)
+    if findings is None:
+        return []
+
+    _cache_put(cache_key, stamp, findings)
+    return list(findings)
+
+
+def _cache_get(key: str, stamp: Tuple[int, int]) -> Optional[List[Vulnerability]]:
+    """Return cached findings for *key* if they were stored for *stamp*."""
+
+    with _FILE_CACHE_LOCK:
+        cached = _FILE_CACHE.get(key)
+        if cached is None or cached[0] != stamp:
+            return None
+        _FILE_CACHE.move_to_end(key)
+        return cached[1]
+
+
+def _cache_put(key: str, stamp: Tuple[int, int], findings: List[Vulnerability]) -> None:
+    if time.time_ns() - stamp[0] < _RACY_MTIME_WINDOW_NS:
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE.pop(key, None)
+        return
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[key] = (stamp, findings)
+        _FILE_CACHE.move_to_end(key)
+        while len(_FILE_CACHE) > _FILE_CACHE_MAX_ENTRIES:
+            _FILE_CACHE.popitem(last=False)
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Return the ``(mtime_ns, size)`` pair used to validate cached findings."""
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_and_scan(
+    path: Path, language: str, cache_dir: Optional[str] = None
+) -> Optional[List[Vulnerability]]:
+    """Read and scan *path*, or return None if it cannot be read."""
+
     try:
-        # Use errors="ignore" to avoid issues with mixed encodings.
-        text = path.read_text(encoding="utf-8", errors="ignore")
+        data = path.read_bytes()
     except OSError:
+        return None
+
+    if cache_dir is None:
+        return scan_text(language=language, file_path=path, text=_decode(data))
+
+    rules = LANGUAGE_RULES.get(language)
+    if not rules:
         return []
 
-    return scan_text(language=language, file_path=path, text=text)
+    entry = _disk_cache_entry(cache_dir, language, data)
+    hits = _load_disk_entry(entry, len(rules))
+    if hits is None:
+        hits = _match_lines(rules, _decode(data))
+        _store_disk_entry(cache_dir, entry, hits)
+    return _build_findings(language, path, hits)
+
+
+def _decode(data: bytes) -> str:
+    """Decode source bytes as UTF-8; newlines are normalized when matching."""
+
+    # Use errors="ignore" to avoid issues with mixed encodings.
+    return data.decode("utf-8", errors="ignore")
+
+
+def _rules_fingerprint() -> bytes:
+    """Digest of every rule definition, mixed into each on-disk cache key."""
+
+    global _rules_digest
+    if _rules_digest is None:
+        digest = hashlib.sha256(b"code-analyzer:%d" % _DISK_CACHE_VERSION)
+        for language in sorted(LANGUAGE_RULES):
+            for rule in LANGUAGE_RULES[language]:
+                digest.update(
+                    repr((
+                        language,
+                        rule.id,
+                        rule.description,
+                        rule.severity,
+                        rule.pattern.pattern,
+                        rule.pattern.flags,
+                    )).encode("utf-8")
+                )
+        _rules_digest = digest.digest()
+    return _rules_digest
+
+
+def _disk_cache_entry(cache_dir: str, language: str, data: bytes) -> str:
+    digest = hashlib.sha256(_rules_fingerprint())
+    digest.update(language.encode("utf-8") + b"\0")
+    digest.update(data)
+    return os.path.join(cache_dir, digest.hexdigest() + ".json")
+
+
+def _load_disk_entry(
+    entry: str, rule_count: int
+) -> Optional[List[Tuple[int, int, str]]]:
+    """Return the hits stored in *entry*, or None on a miss.
+
+    Missing, unreadable, damaged or malformed entries are all misses, so the
+    file is scanned again and the entry rewritten.
+    """
+
+    try:
+        with open(entry, "rb") as f:
+            raw = json.load(f)
+    except (OSError, ValueError, RecursionError):
+        return None
+
+    if not isinstance(raw, list):
+        return None
+    hits: List[Tuple[int, int, str]] = []
+    for item in raw:
+        if not isinstance(item, list) or len(item) != 3:
+            return None
+        line_no, index, code = item
+        if (
+            type(line_no) is not int
+            or type(index) is not int
+            or not isinstance(code, str)
+            or line_no < 1
+            or not 0 <= index < rule_count
+        ):
+            return None
+        hits.append((line_no, index, code))
+    return hits
+
+
+def _store_disk_entry(
+    cache_dir: str, entry: str, hits: List[Tuple[int, int, str]]
+) -> None:
+    # Best effort: a cache that cannot be written only costs a re-scan later.
+    # Entries are written to a temporary file and renamed into place so that
+    # concurrent scans never see a partial entry.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_ENTRY_ENCODER.encode(hits).encode("utf-8"))
+        os.replace(tmp, entry)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def clear_cache() -> None:
+    """Forget findings cached in this process by earlier scans."""
+
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE.clear()
 
 
 def iter_project_files(root: Path) -> Iterable[Path]:
     """Yield source files under *root* while skipping typical dependency dirs."""
 
+    for path, _language in _iter_project_sources(root):
+        yield path
+
+
+def _iter_project_sources(root: Path) -> Iterable[Tuple[Path, str]]:
+    """Yield ``(path, language)`` for each source file under *root*.
+
+    The language is detected once here and handed to the scanner, so files
+    are not classified a second time by :func:`scan_file`.
+    """
+
     root = root.resolve()
 
     if root.is_file():
-        yield root
+        language = detect_language(root)
+        if language is not None:
+            yield root, language
         return
 
     for dirpath, dirnames, filenames in os.walk(root):
@@ -311,18 +637,118 @@ def iter_project_files(root: Path) -> Iterable[Path]:
             if d not in EXCLUDED_DIRS
         ]
 
+        # Classify by the name string first (the same suffix rule as
+        # Path.suffix) so that no Path is built for non-source files.
         for filename in filenames:
-            full_path = Path(dirpath, filename)
-            if detect_language(full_path) is not None:
-                yield full_path
+            dot = filename.rfind(".")
+            if 0 < dot < len(filename) - 1:
+                language = EXTENSION_LANGUAGE.get(filename[dot:].lower())
+                if language is not None:
+                    yield Path(dirpath, filename), language
 
 
-def scan_project(root: Path) -> List[Vulnerability]:
-    """Scan all supported source files under *root* and return findings."""
+def scan_project(
+    root: Path,
+    executor: Optional[Executor] = None,
+    cache_dir: Optional[Path] = None,
+) -> List[Vulnerability]:
+    """Scan all supported source files under *root* and return findings.
 
-    findings: List[Vulnerability] = []
+    Files are independent of each other, so when an *executor* (e.g. a
+    ``ProcessPoolExecutor``) is given the per-file scans are fanned out to
+    it. Results are returned in the same order as a sequential scan.
 
-    for path in iter_project_files(root):
-        findings.extend(scan_file(path))
+    If *cache_dir* is given, per-file results are also kept on disk there
+    and reused by later runs for files whose contents are unchanged.
+    """
 
+    findings: List[Vulnerability] = []
+    for file_findings in scan_project_iter(root, executor, cache_dir):
+        findings.extend(file_findings)
     return findings
+
+
+def new_scan_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return a process pool to pass as the *executor* of the scan functions.
+
+    Front ends create the pool's workers lazily from handler or worker
+    threads, and forking a multi-threaded process is unsafe, so workers are
+    started from a fork server (or spawned where that is unavailable).
+
+    If a worker dies (e.g. killed for running out of memory) the pool raises
+    ``concurrent.futures.BrokenExecutor`` and rejects all further work, so
+    callers should discard it and create a new one.
+    """
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def scan_project_iter(
+    root: Path,
+    executor: Optional[Executor] = None,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[List[Vulnerability]]:
+    """Yield the findings of each supported file under *root* as it is scanned.
+
+    Files come out in the same order :func:`scan_project` would return them,
+    so callers can show early results while the rest of the project is still
+    being scanned. Each yielded list is a fresh copy the caller may keep.
+    *executor* and *cache_dir* are as for :func:`scan_project`.
+    """
+
+    cache_dir_str = None if cache_dir is None else str(cache_dir)
+
+    # A language without any rules cannot produce findings, so its files are
+    # skipped before they are stat'ed or read.
+    active_languages = {language for language, rules in LANGUAGE_RULES.items() if rules}
+    sources = (
+        (path, language)
+        for path, language in _iter_project_sources(root)
+        if language in active_languages
+    )
+
+    if executor is None:
+        for path, language in sources:
+            yield _scan_source(path, language, cache_dir_str)
+        return
+
+    # The cache lives in this process, so look it up here and only hand
+    # files that changed (or were never scanned) to the executor's workers.
+    plan: List[Tuple[Path, Tuple[int, int], Optional[List[Vulnerability]]]] = []
+    pending_paths: List[Path] = []
+    pending_languages: List[str] = []
+
+    for path, language in sources:
+        stamp = _file_stamp(path)
+        if stamp is None:
+            continue
+        cached = _cache_get(str(path), stamp)
+        if cached is not None:
+            plan.append((path, stamp, cached))
+        else:
+            plan.append((path, stamp, None))
+            pending_paths.append(path)
+            pending_languages.append(language)
+
+    # map() yields results in submission order, which is the order of the
+    # pending entries in *plan*.
+    scanned = executor.map(
+        _read_and_scan,
+        pending_paths,
+        pending_languages,
+        itertools.repeat(cache_dir_str),
+        chunksize=8,
+    )
+    for path, stamp, cached_findings in plan:
+        if cached_findings is not None:
+            yield list(cached_findings)
+            continue
+        file_findings = next(scanned)
+        if file_findings is None:
+            continue
+        _cache_put(str(path), stamp, file_findings)
+        yield list(file_findings)
@@ -1,14 +1,36 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from datetime import datetime
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from operator import attrgetter
 from pathlib import Path
+from typing import Optional, Tuple
 from urllib.parse import urlparse, parse_qs, quote
 import html
+import os
+import sys
+import threading
+import time
 
-from detectors.vulnerability_scanner import scan_project, Vulnerability
+from detectors.vulnerability_scanner import new_scan_pool, scan_project, Vulnerability
 
 # Base directory for browsing; restrict folder picker to this tree
 BASE_ROOT = Path(__file__).resolve().parent
 
+# Worker processes that scans are fanned out to. Created by run_server() so
+# that merely importing this module never forks; None scans in-thread.
+_scan_executor: Optional[Executor] = None
+_scan_executor_lock = threading.Lock()
+
+
+def _replace_broken_executor(broken: Executor) -> None:
+    """Swap in a fresh pool after *broken* lost a worker process."""
+
+    global _scan_executor
+    with _scan_executor_lock:
+        # Another request may already have replaced it.
+        if _scan_executor is broken:
+            _scan_executor = new_scan_pool()
+    broken.shutdown(wait=False)
+
 
 HTML_TEMPLATE = """<!doctype html>
 <html lang="en">
@@ -54,32 +76,72 @@ HTML_TEMPLATE = """<!doctype html>
 """
 
 
+# The template is split once around its three placeholders so rendering is a
+# single join of the static chunks with the per-request values, rather than
+# three str.replace passes over the whole page on every request.
+_TEMPLATE_HEAD, _rest = HTML_TEMPLATE.split("{time}", 1)
+_TEMPLATE_AFTER_TIME, _rest = _rest.split("{path}", 1)
+_TEMPLATE_AFTER_PATH, _TEMPLATE_TAIL = _rest.split("{content}", 1)
+del _rest
+
+# The plain index page (no path, no results) only varies by the clock.
+_INDEX_AFTER_TIME = _TEMPLATE_AFTER_TIME + _TEMPLATE_AFTER_PATH + _TEMPLATE_TAIL
+
+# Row CSS class per (upper-cased) severity; anything else gets no class.
+_SEV_CLASS = {"HIGH": "sev-HIGH", "MEDIUM": "sev-MEDIUM", "LOW": "sev-LOW"}
+
+# Formatted server time, keyed on the whole second it was produced for. The
+# text only changes once a second, so under load most requests reuse it.
+_time_cache: Tuple[int, str] = (-1, "")
+
+
+def _server_time() -> str:
+    """Return the current local time as shown in the page header."""
+
+    global _time_cache
+    now = int(time.time())
+    cached_at, text = _time_cache
+    if now != cached_at:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        # Rebinding a tuple keeps the pair consistent across handler threads.
+        _time_cache = (now, text)
+    return text
+
+
 def _render_template(*, path: str, content: str, time_str: str) -> str:
-    """Simple placeholder replacement without interpreting CSS braces.
+    """Simple placeholder substitution without interpreting CSS braces.
 
     We avoid str.format(), which would try to treat CSS braces as
-    formatting fields and raise KeyError. Instead we replace only the
-    three placeholders we intentionally use.
+    formatting fields and raise KeyError. Instead the template is
+    pre-split around the three placeholders we intentionally use.
     """
 
-    body = HTML_TEMPLATE
-    body = body.replace("{time}", html.escape(time_str))
-    body = body.replace("{path}", html.escape(path))
-    body = body.replace("{content}", content)
-    return body
+    return "".join(
+        (
+            _TEMPLATE_HEAD,
+            html.escape(time_str),
+            _TEMPLATE_AFTER_TIME,
+            html.escape(path),
+            _TEMPLATE_AFTER_PATH,
+            content,
+            _TEMPLATE_TAIL,
+        )
+    )
 
 
 def render_index(path: str = "") -> str:
     """Render the index page with an optional path and no results."""
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = _server_time()
+    if not path:
+        return _TEMPLATE_HEAD + html.escape(now) + _INDEX_AFTER_TIME
     return _render_template(path=path, content="", time_str=now)
 
 
 def render_results(path: str, findings: list[Vulnerability]) -> str:
     """Render the page with a table of findings for a given path."""
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = _server_time()
 
     if not findings:
         content = "<div class='no-results'>No potential vulnerabilities found.</div>"
@@ -97,7 +159,7 @@ def render_results(path: str, findings: list[Vulnerability]) -> str:
         location_html = f"<span class='path'>{html.escape(location)}</span>"
         desc = html.escape(v.description)
         code = html.escape(v.code or "")
-        sev_class = f"sev-{sev}" if sev in {"HIGH", "MEDIUM", "LOW"} else ""
+        sev_class = _SEV_CLASS.get(sev, "")
 
         rows.append(
             f"<tr class='{sev_class}'>"
@@ -138,13 +200,16 @@ def _safe_browse_path(raw_path: str) -> Path:
 def render_browse(path: Path) -> str:
     """Render a simple server-side folder picker UI."""
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = _server_time()
 
+    # os.scandir() hands back the file type read with the directory listing,
+    # so is_dir() normally needs no extra stat() call per entry.
     try:
-        entries = sorted(
-            [p for p in path.iterdir() if p.is_dir()],
-            key=lambda p: p.name.lower(),
-        )
+        with os.scandir(path) as it:
+            entries = sorted(
+                (entry for entry in it if entry.is_dir()),
+                key=lambda entry: entry.name.lower(),
+            )
     except OSError:
         entries = []
 
@@ -165,9 +230,8 @@ def render_browse(path: Path) -> str:
         )
 
     for entry in entries:
-        name = entry.name or str(entry)
         parts.append(
-            f"<li><a href=\"/browse?path={quote(str(entry))}\">{html.escape(name)}</a></li>"
+            f"<li><a href=\"/browse?path={quote(entry.path)}\">{html.escape(entry.name)}</a></li>"
         )
 
     parts.append("</ul>")
@@ -185,12 +249,38 @@ def render_browse(path: Path) -> str:
 
 
 class SimpleHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response carries a
+    # Content-Length so the client knows where each one ends.
+    protocol_version = "HTTP/1.1"
+    # Each kept-alive connection holds a pool worker while it waits for the
+    # next request, so connections that stay idle this long (seconds) are
+    # dropped. The socket timeout is only applied while a request is being
+    # read; see handle_one_request() and parse_request().
+    timeout = 5
+
+    def handle_one_request(self):
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+
+    def parse_request(self):
+        ok = super().parse_request()
+        # The request line and headers are in. Lift the timeout, which would
+        # otherwise also bound sendall() and cut off a large results page
+        # sent to a slow client.
+        self.connection.settimeout(None)
+        # On the accepting thread (pool saturated), serve this one request and
+        # close, so a busy keep-alive client cannot stop new connections from
+        # being accepted.
+        handling_inline = getattr(self.server, "handling_inline", None)
+        if handling_inline is not None and handling_inline():
+            self.close_connection = True
+        return ok
+
     def do_GET(self):
         parsed = urlparse(self.path)
 
         if parsed.path == "/":
-            html_body = render_index()
-            self._send_html(html_body)
+            self._send_html(render_index())
         elif parsed.path == "/scan":
             self.handle_scan(parsed)
         elif parsed.path == "/browse":
@@ -208,20 +298,20 @@ class SimpleHandler(BaseHTTPRequestHandler):
         except Exception:
             root = Path(".").resolve()
 
-        findings = scan_project(root)
+        executor = _scan_executor
+        try:
+            findings = scan_project(root, executor=executor)
+        except BrokenExecutor:
+            # A broken pool rejects all further work; replace it.
+            _replace_broken_executor(executor)
+            self.send_error(503, "Scan failed: a worker process died; please retry")
+            return
 
         # Sort by severity then file/line for a stable display
-        severity_order = {"high": 0, "medium": 1, "low": 2}
-
-        def sort_key(v: Vulnerability):
-            return (
-                severity_order.get(v.severity.lower(), 3),
-                v.file_path,
-                v.line,
-                v.rule_id,
-            )
-
-        findings_sorted = sorted(findings, key=sort_key)
+        findings_sorted = sorted(
+            findings,
+            key=attrgetter("severity_rank", "file_path", "line", "rule_id"),
+        )
         html_body = render_results(path_str, findings_sorted)
         self._send_html(html_body)
 
@@ -233,18 +323,96 @@ class SimpleHandler(BaseHTTPRequestHandler):
         self._send_html(html_body)
 
     def _send_html(self, content: str):
+        body = content.encode("utf-8")
+        # Send the page as one encoded buffer with an explicit length so the
+        # client does not have to wait for the connection to close.
         self.send_response(200)
         self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
         self.end_headers()
-        self.wfile.write(content.encode("utf-8"))
+        self.wfile.write(body)
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """HTTP server that handles requests on a bounded pool of threads.
+
+    ThreadingHTTPServer starts a new thread for every connection, so a burst
+    of requests can create an unbounded number of threads. Here requests run
+    on a fixed-size ThreadPoolExecutor, and at most *max_queued* more may
+    wait for a worker. Beyond that the accepting thread handles the request
+    itself, which stops it from accepting new connections until it is done
+    (back-pressure instead of an ever-growing queue). Such a connection is
+    closed after a single request even if the client asked for keep-alive.
+    """
+
+    def __init__(self, server_address, handler_class, *, max_workers: int, max_queued: int):
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="http-worker"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._inline = threading.local()
+
+    def handling_inline(self) -> bool:
+        """Return True while the accepting thread is serving a request itself."""
+
+        return getattr(self._inline, "active", False)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self._inline.active = True
+            try:
+                self.process_request_thread(request, client_address)
+            finally:
+                self._inline.active = False
+            return
+        self._pool.submit(self._process_pooled, request, client_address)
+
+    def _process_pooled(self, request, client_address):
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown()
+
+
+def _worker_count(value: str) -> int:
+    """Parse CODE_ANALYZER_WORKERS: a positive number of request threads."""
+
+    try:
+        workers = int(value)
+    except ValueError:
+        sys.exit(f"CODE_ANALYZER_WORKERS: invalid int value: {value!r}")
+    if workers < 1:
+        sys.exit(f"CODE_ANALYZER_WORKERS: must be a positive number, got {workers}")
+    return workers
 
 
 def run_server():
+    global _scan_executor
+
     server_address = ("", 8080)
-    httpd = HTTPServer(server_address, SimpleHandler)
+    # Handle requests on a bounded thread pool so a long scan does not block
+    # page loads or folder browsing; the CPU-bound per-file scanning itself
+    # runs on a process pool so it does not compete for the GIL.
+    workers = _worker_count(os.environ.get("CODE_ANALYZER_WORKERS", "10"))
+    httpd = PooledHTTPServer(
+        server_address, SimpleHandler, max_workers=workers, max_queued=2 * workers
+    )
+    _scan_executor = new_scan_pool()
     print("Web analyzer running at http://localhost:8080 ...")
     print("Open this URL in your browser, enter a project path, and click Scan.")
-    httpd.serve_forever()
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        _scan_executor.shutdown()
+        _scan_executor = None
 
 
 if __name__ == "__main__":
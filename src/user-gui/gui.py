@@ -1,15 +1,106 @@
 import wx
 from datetime import datetime
 import sys
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import BrokenExecutor, CancelledError, ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+try:
+    from detectors.vulnerability_scanner import new_scan_pool, scan_project_iter, Vulnerability
+except ImportError:
+    # Running from a checkout: make the project root (which contains the
+    # detectors package) importable, then retry.
+    ROOT_DIR = Path(__file__).resolve().parents[2]
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    from detectors.vulnerability_scanner import new_scan_pool, scan_project_iter, Vulnerability
+
+
+class FindingsListCtrl(wx.ListCtrl):
+    """Virtual report list of findings.
+
+    wx only asks for the text of rows that are actually visible, so showing
+    thousands of findings does not require one InsertItem/SetItem call per
+    cell up front. Rows are kept sorted by severity, then file and line.
+    """
+
+    SORT_KEY = attrgetter("severity_rank", "file_path", "line", "rule_id")
+
+    # Background colours per severity rank, matching the web UI.
+    SEVERITY_COLOURS = {
+        0: wx.Colour(255, 229, 229),  # high
+        1: wx.Colour(255, 245, 224),  # medium
+        2: wx.Colour(233, 245, 255),  # low
+    }
+
+    def __init__(self, parent):
+        super().__init__(
+            parent,
+            style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.BORDER_SUNKEN | wx.LC_SINGLE_SEL,
+        )
+        self.findings: List[Vulnerability] = []
+        # SORT_KEY of each finding, so new ones can be placed by bisection.
+        self._keys: List[tuple] = []
+        # Display strings per row, built the first time wx asks for the row
+        # and reused on every later repaint or scroll.
+        self._rows: List[Optional[Tuple[str, str, str, str, str]]] = []
+        self._severity_attrs = {}
+        for rank, colour in self.SEVERITY_COLOURS.items():
+            attr = wx.ItemAttr()
+            attr.SetBackgroundColour(colour)
+            self._severity_attrs[rank] = attr
+
+    def set_findings(self, findings: List[Vulnerability]):
+        self.findings = sorted(findings, key=self.SORT_KEY)
+        self._keys = [self.SORT_KEY(v) for v in self.findings]
+        self._rows = [None] * len(self.findings)
+        self._refresh_rows()
+
+    def add_findings(self, findings: List[Vulnerability]):
+        """Insert *findings* at their sorted positions without a full re-sort."""
+
+        # wx tracks the selection by row index, so follow the selected
+        # finding as rows are inserted above it.
+        selected = self.GetFirstSelected()
+        new_selected = selected
+
+        keys = self._keys
+        for v in findings:
+            key = self.SORT_KEY(v)
+            index = bisect_right(keys, key)
+            keys.insert(index, key)
+            self.findings.insert(index, v)
+            self._rows.insert(index, None)
+            if index <= new_selected:
+                new_selected += 1
+        self._refresh_rows()
+
+        if new_selected != selected:
+            self.Select(selected, on=0)
+            self.Select(new_selected)
+            self.Focus(new_selected)
+
+    def _refresh_rows(self):
+        self.SetItemCount(len(self.findings))
+        if self.findings:
+            self.RefreshItems(0, len(self.findings) - 1)
+        else:
+            self.Refresh()
 
-# Ensure the project root (which contains the detectors package) is importable
-ROOT_DIR = Path(__file__).resolve().parents[2]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
+    def OnGetItemText(self, item, column):
+        row = self._rows[item]
+        if row is None:
+            v = self.findings[item]
+            row = (v.severity.upper(), v.language, v.rule_id, v.file_path, str(v.line))
+            self._rows[item] = row
+        return row[column]
 
-from detectors.vulnerability_scanner import scan_project, Vulnerability
+    def OnGetItemAttr(self, item):
+        return self._severity_attrs.get(self.findings[item].severity_rank)
 
 
 class TimeFrame(wx.Frame):
@@ -17,7 +108,9 @@ class TimeFrame(wx.Frame):
         super().__init__(parent=None, title="Code Analyzer")
         self.server_time = server_time
         self.selected_path: Optional[Path] = None
-        self._current_findings: List[Vulnerability] = []
+        # Worker processes for per-file scanning, created on the first scan
+        # and reused for every later one.
+        self._pool: Optional[ProcessPoolExecutor] = None
 
         panel = wx.Panel(self)
         main_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -60,10 +153,7 @@ class TimeFrame(wx.Frame):
         main_sizer.Add(results_label, 0, wx.LEFT | wx.TOP, 5)
 
         # Table of findings
-        self.results_list = wx.ListCtrl(
-            panel,
-            style=wx.LC_REPORT | wx.BORDER_SUNKEN | wx.LC_SINGLE_SEL,
-        )
+        self.results_list = FindingsListCtrl(panel)
         self.results_list.InsertColumn(0, "Severity", width=90)
         self.results_list.InsertColumn(1, "Lang", width=80)
         self.results_list.InsertColumn(2, "Rule", width=80)
@@ -90,13 +180,19 @@ class TimeFrame(wx.Frame):
 
         panel.SetSizer(main_sizer)
 
-        # --- Timer for updating time labels ---
-        self.timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.update_time)
-        self.timer.Start(1000)
+        # --- Time labels: refreshed once per wall-clock second ---
+        self._last_local_label: Optional[str] = None
+        self._last_server_label: Optional[str] = None
+        self._time_call: Optional[wx.CallLater] = None
         self.update_time(None)
 
+        # Selection changes are coalesced so that holding an arrow key does
+        # not rewrite the details pane for every row passed over.
+        self._pending_finding: Optional[Vulnerability] = None
+        self._selection_call: Optional[wx.CallLater] = None
+
         # --- Wire up events ---
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.select_button.Bind(wx.EVT_BUTTON, self.on_select_folder)
         self.scan_button.Bind(wx.EVT_BUTTON, self.on_scan_clicked)
         self.results_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_result_selected)
@@ -106,15 +202,38 @@ class TimeFrame(wx.Frame):
         self.Show()
 
     def update_time(self, event):
-        # Update local time
-        local_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.local_label.SetLabel(f"Local Time: {local_time}")
+        now = datetime.now()
+
+        # Update local time; SetLabel forces a relayout, so skip it when the
+        # text is unchanged.
+        local_label = f"Local Time: {now.strftime('%Y-%m-%d %H:%M:%S')}"
+        if local_label != self._last_local_label:
+            self.local_label.SetLabel(local_label)
+            self._last_local_label = local_label
 
         # Update server time if available
-        if self.server_time:
-            self.server_label.SetLabel(f"Server Time: {self.server_time}")
-        else:
-            self.server_label.SetLabel("")
+        server_label = f"Server Time: {self.server_time}" if self.server_time else ""
+        if server_label != self._last_server_label:
+            self.server_label.SetLabel(server_label)
+            self._last_server_label = server_label
+
+        # Single-shot rescheduling aligned to the start of the next second,
+        # rather than a free-running 1 Hz timer that drifts against the clock.
+        self._time_call = wx.CallLater(
+            1000 - now.microsecond // 1000, self.update_time, None
+        )
+
+    def on_close(self, event):
+        if self._time_call is not None:
+            self._time_call.Stop()
+            self._time_call = None
+        if self._selection_call is not None:
+            self._selection_call.Stop()
+            self._selection_call = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        event.Skip()
 
     def on_select_folder(self, event):
         dlg = wx.DirDialog(
@@ -147,61 +266,109 @@ class TimeFrame(wx.Frame):
             return
 
         # Clear previous results and show progress message
-        self.results_list.DeleteAllItems()
+        if self._selection_call is not None:
+            self._selection_call.Stop()
+            self._selection_call = None
+        self.results_list.set_findings([])
         self.details.SetValue("Scanning project...\n")
-        wx.GetApp().Yield()  # allow UI to refresh while scanning
-
-        findings = scan_project(root)
-        self.display_results(findings)
 
-    def display_results(self, findings: List[Vulnerability]):
-        # Store current findings for selection handling
-        self._current_findings = []
-        self.results_list.DeleteAllItems()
-
-        if not findings:
-            self.details.SetValue("No potential vulnerabilities found.\n")
+        # Scan on a worker thread so the event loop keeps painting and
+        # handling input; results are handed back via wx.CallAfter.
+        self.select_button.Disable()
+        self.scan_button.Disable()
+        if self._pool is None:
+            self._pool = new_scan_pool()
+        threading.Thread(
+            target=self._scan_worker, args=(root, self._pool), daemon=True
+        ).start()
+
+    # Findings are handed to the UI in batches of this many items, or after
+    # this many seconds, whichever comes first.
+    STREAM_BATCH_SIZE = 50
+    STREAM_BATCH_INTERVAL = 0.1
+
+    def _scan_worker(self, root: Path, pool: ProcessPoolExecutor):
+        batch: List[Vulnerability] = []
+        last_flush = time.monotonic()
+        try:
+            for file_findings in scan_project_iter(root, executor=pool):
+                batch.extend(file_findings)
+                now = time.monotonic()
+                if batch and (
+                    len(batch) >= self.STREAM_BATCH_SIZE
+                    or now - last_flush >= self.STREAM_BATCH_INTERVAL
+                ):
+                    wx.CallAfter(self._append_findings, batch)
+                    batch = []
+                    last_flush = now
+        except CancelledError:
+            # The window was closed and the pool shut down mid-scan.
             return
+        except Exception as exc:
+            wx.CallAfter(self._on_scan_failed, pool, exc)
+            return
+        wx.CallAfter(self._on_scan_finished, batch)
 
-        # Sort by severity (high > medium > low), then by file and line
-        severity_order = {"high": 0, "medium": 1, "low": 2}
+    def _append_findings(self, findings: List[Vulnerability]):
+        # The window may have been closed while the scan was running.
+        if not self:
+            return
+        self.results_list.add_findings(findings)
 
-        def sort_key(v: Vulnerability):
-            return (
-                severity_order.get(v.severity.lower(), 3),
-                v.file_path,
-                v.line,
-                v.rule_id,
-            )
+    def _on_scan_finished(self, findings: List[Vulnerability]):
+        if not self:
+            return
+        self.select_button.Enable()
+        self.scan_button.Enable()
+        self.results_list.add_findings(findings)
 
-        findings_sorted = sorted(findings, key=sort_key)
-        self._current_findings = findings_sorted
+        if not self.results_list.findings:
+            self.details.SetValue("No potential vulnerabilities found.\n")
+            return
 
-        for v in findings_sorted:
-            index = self.results_list.InsertItem(
-                self.results_list.GetItemCount(), v.severity.upper()
-            )
-            self.results_list.SetItem(index, 1, v.language)
-            self.results_list.SetItem(index, 2, v.rule_id)
-            self.results_list.SetItem(index, 3, v.file_path)
-            self.results_list.SetItem(index, 4, str(v.line))
-
-        # Show details for the first finding by default
-        self.details.SetValue("")
-        if findings_sorted:
+        # Show details for the first finding unless one was picked already
+        if self.results_list.GetFirstSelected() == -1:
             self.results_list.Select(0)
             self.show_details_for_index(0)
 
+    def _on_scan_failed(self, pool: ProcessPoolExecutor, exc: Exception):
+        if not self:
+            return
+        # A broken pool rejects all further work; the next scan makes a new one.
+        if isinstance(exc, BrokenExecutor) and self._pool is pool:
+            pool.shutdown(wait=False)
+            self._pool = None
+        self.select_button.Enable()
+        self.scan_button.Enable()
+        self.details.SetValue(f"Scan failed: {exc!r}\n")
+
+    # Delay (ms) before the details pane follows the list selection.
+    SELECTION_DEBOUNCE_MS = 40
+
     def on_result_selected(self, event):
+        # Remember the finding rather than its row: rows streamed in while
+        # the update is pending can shift it to another index.
         index = event.GetIndex()
-        self.show_details_for_index(index)
+        findings = self.results_list.findings
+        self._pending_finding = findings[index] if 0 <= index < len(findings) else None
+        if self._selection_call is None:
+            self._selection_call = wx.CallLater(
+                self.SELECTION_DEBOUNCE_MS, self._flush_selection
+            )
+
+    def _flush_selection(self):
+        self._selection_call = None
+        self.show_details(self._pending_finding)
 
     def show_details_for_index(self, index: int):
-        if index < 0 or index >= len(self._current_findings):
+        findings = self.results_list.findings
+        self.show_details(findings[index] if 0 <= index < len(findings) else None)
+
+    def show_details(self, v: Optional[Vulnerability]):
+        if v is None:
             self.details.SetValue("")
             return
 
-        v = self._current_findings[index]
         lines: List[str] = []
         lines.append(f"Severity : {v.severity.upper()}")
         lines.append(f"Language : {v.language}")